@@ -1,14 +1,19 @@
+import asyncio
 import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from typing import Optional, Dict, Any, List, Union
-import brotli
+import aiohttp
 import httpx
+import msgspec
+from httpx_aiohttp import AiohttpTransport
 import time
 import random
-import json
+from itertools import zip_longest
+import orjson
 import os
-from pydantic import BaseModel
 
 """
 FastAPI application that provides a DeepL translation API wrapper.
@@ -16,12 +21,60 @@ This service allows for text translation using DeepL's service without requiring
 """
 
 PROXY = os.environ.get('PROXY', None)
-TOKEN = set(os.environ.get('TOKEN', '').split(','))
+TOKEN = frozenset(os.environ.get('TOKEN', '').split(','))
+# Authorization header schemes and their lengths, stripped before token lookup
+_AUTH_PREFIXES = (('Bearer ', 7), ('DeepL-Auth-Key ', 15))
+HTTP_BACKEND = os.environ.get('HTTP_BACKEND', 'httpx').lower()
+
+# Maximum number of DeepL requests in flight at once, and retries when DeepL answers 429
+DEEPL_CONCURRENCY = int(os.environ.get('DEEPL_CONCURRENCY', '32'))
+DEEPL_MAX_RETRIES = 2
+DEEPL_RETRY_BACKOFF = 0.5
+
+# Connection pool to DeepL, shared by both HTTP backends
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_KEEPALIVE_EXPIRY = 60
+
+CACHE_SIZE = int(os.environ.get('CACHE_SIZE', '4096'))
+# Upper bound on the total characters of source text held by the cache
+CACHE_MAX_CHARS = 16_000_000
+
+# Inputs shorter than this (single line, no tags) are treated as one sentence
+SHORT_TEXT_LIMIT = 500
+
+HEADERS = {
+    'accept': '*/*',
+    'accept-encoding': 'gzip, br',
+    'accept-language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh-TW;q=0.7,zh-HK;q=0.6,zh;q=0.5',
+    'authorization': 'None',
+    'cache-control': 'no-cache',
+    'content-type': 'application/json',
+    'dnt': '1',
+    'origin': 'chrome-extension://cofdbpoegempjloogbagkncekinflcnj',
+    'pragma': 'no-cache',
+    'priority': 'u=1, i',
+    'referer': 'https://www.deepl.com/',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'none',
+    'sec-gpc': '1',
+    'user-agent': 'DeepLBrowserExtension/1.29.0 Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36',
+}
+
+DEEPL_URL = "https://www2.deepl.com/jsonrpc?client=chrome-extension,1.29.0"
+URL_HANDLE = f"{DEEPL_URL}?client=chrome-extension,1.28.0&method=LMT_handle_jobs"
+URL_SPLIT = f"{DEEPL_URL}?client=chrome-extension,1.28.0&method=LMT_split_text"
+_URLS = {'LMT_handle_jobs': URL_HANDLE, 'LMT_split_text': URL_SPLIT}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+_DEEPL_SEM = asyncio.Semaphore(DEEPL_CONCURRENCY)
 
 # Define request/response models
-class TranslationRequest(BaseModel):
+class TranslationRequest(msgspec.Struct):
     """
-    Pydantic model for translation request parameters.
+    msgspec struct for translation request parameters.
     
     Attributes:
         text (Union[str, List[str]]): Text to translate
@@ -29,14 +82,14 @@ class TranslationRequest(BaseModel):
         target_lang (str): Target language code (default: 'en')
         tag_handling (str): Optional HTML tag handling parameter
     """
-    text: str | List[str]
-    source_lang: Optional[str] = 'auto'
-    target_lang: Optional[str] = 'en'
+    text: Union[str, List[str]]
+    source_lang: str = 'auto'
+    target_lang: str = 'en'
     tag_handling: Optional[str] = None
 
-class TranslationResponse(BaseModel):
+class TranslationResponse(msgspec.Struct):
     """
-    Pydantic model for translation response.
+    msgspec struct for translation response.
     
     Attributes:
         alternatives (List[str]): List of alternative translations
@@ -55,7 +108,63 @@ class TranslationResponse(BaseModel):
     source_lang: str
     target_lang: str
 
-app = FastAPI()
+# OpenAPI schemas for the msgspec structs, so /docs still describes the translate endpoint
+_, _SCHEMAS = msgspec.json.schema_components(
+    [TranslationRequest, TranslationResponse],
+    ref_template="#/components/schemas/{name}"
+)
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build the shared HTTP client according to HTTP_BACKEND.
+
+    'httpx' (default) uses httpx's own HTTP/2-capable transport. 'aiohttp' keeps
+    the httpx API but sends requests through aiohttp's connection handling, which
+    holds up better under heavy concurrency (HTTP/1.1 only).
+
+    Returns:
+        httpx.AsyncClient: Client to be shared by all requests
+    """
+    if HTTP_BACKEND == 'aiohttp':
+        # Proxy and pool limits belong to the aiohttp session when it owns the transport
+        session = aiohttp.ClientSession(
+            proxy=PROXY,
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNECTIONS,
+                keepalive_timeout=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        return httpx.AsyncClient(
+            headers=HEADERS,
+            transport=AiohttpTransport(client=session)
+        )
+
+    return httpx.AsyncClient(
+        headers=HEADERS,
+        proxy=PROXY,
+        # One HTTP/2 connection multiplexes many in-flight requests to the single DeepL origin
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open a single HTTP client for the lifetime of the application.
+
+    The client (and its connection pool) is shared by every request, so calls to
+    DeepL reuse keep-alive connections instead of paying a new TCP/TLS handshake
+    each time.
+    """
+    async with create_http_client() as client:
+        app.state.http_client = client
+        yield
+
+app = FastAPI(lifespan=lifespan)
 
 # Token verification dependency
 async def verify_token(request: Request) -> bool:
@@ -78,16 +187,15 @@ async def verify_token(request: Request) -> bool:
     auth_header = request.headers.get('Authorization', '')
     
     # Extract token from different Authorization header formats
-    token_header = ''
-    if auth_header.startswith('Bearer '):
-        token_header = auth_header[7:]  # Remove 'Bearer ' prefix
-    elif auth_header.startswith('DeepL-Auth-Key '):
-        token_header = auth_header[15:]  # Remove 'DeepL-Auth-Key ' prefix
+    for prefix, prefix_len in _AUTH_PREFIXES:
+        if auth_header.startswith(prefix):
+            token_header = auth_header[prefix_len:]  # Remove scheme prefix
+            break
     else:
         token_header = auth_header  # Use raw header value
     
     # Check if any token variant matches
-    if any(token in TOKEN for token in [token_param, token_header]):
+    if token_param in TOKEN or token_header in TOKEN:
         return True
         
     raise HTTPException(status_code=401, detail="Invalid Token")
@@ -97,33 +205,19 @@ class DeepLX:
     DeepL translation client that interfaces with DeepL's web API.
     Provides methods for text splitting and translation without requiring an official API key.
     """
+
+    # Source language of the most recent split, used to guess the language for speculative
+    # requests. Process-global: shared (read and written) by every request in this worker.
+    last_detected_lang: Optional[str] = None
     
-    def __init__(self, http_proxy=None):
+    def __init__(self, client: httpx.AsyncClient):
         """
         Initialize DeepLX client.
         
         Args:
-            http_proxy (str, optional): HTTP proxy URL
+            client (httpx.AsyncClient): Shared HTTP client used to reach DeepL
         """
-        self.url = "https://www2.deepl.com/jsonrpc?client=chrome-extension,1.29.0"
-        self.headers = {
-            'accept': '*/*',
-            'accept-language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh-TW;q=0.7,zh-HK;q=0.6,zh;q=0.5',
-            'authorization': 'None',
-            'cache-control': 'no-cache',
-            'content-type': 'application/json',
-            'dnt': '1',
-            'origin': 'chrome-extension://cofdbpoegempjloogbagkncekinflcnj',
-            'pragma': 'no-cache',
-            'priority': 'u=1, i',
-            'referer': 'https://www.deepl.com/',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'none',
-            'sec-gpc': '1',
-            'user-agent': 'DeepLBrowserExtension/1.29.0 Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36',
-        }
-        self.http_proxy = http_proxy
+        self.client = client
 
 
     @staticmethod
@@ -134,9 +228,7 @@ class DeepLX:
     @staticmethod
     def get_random_number() -> int:
         """Generate random request ID within DeepL's expected range."""
-        src = random.Random(time.time_ns())
-        num = src.randint(8300000, 8399999)
-        return num * 1000
+        return random.randrange(8_300_000_000, 8_400_000_000, 1000)
 
     @staticmethod
     def get_timestamp(i_count: int) -> int:
@@ -159,64 +251,99 @@ class DeepLX:
     @staticmethod
     def is_richtext(text: str) -> bool:
         """Check if text contains HTML-like tags"""
-        return bool(re.search(r'<[^>]+>', text))
+        # Plain text (no '<' at all) is the common case: settle it with one C-level scan
+        if '<' not in text:
+            return False
+        return bool(_TAG_RE.search(text))
 
     @staticmethod
-    def format_post_string(post_data: dict) -> str:
-        """Format the JSON string with specific spacing rules for the 'method' field"""
-        post_str = json.dumps(post_data, ensure_ascii=False)
-        
-        if (post_data["id"] + 5) % 29 == 0 or (post_data["id"] + 3) % 13 == 0:
-            post_str = post_str.replace('"method":"', '"method" : "', 1)
+    def build_post_body(method: str, post_id: int, params: Dict[str, Any]) -> bytes:
+        """
+        Serialize a JSON-RPC request with DeepL's spacing rules for the 'method' field.
+
+        Only params goes through orjson; the envelope is assembled around it with
+        the right spacing chosen up front, so the output is never rescanned.
+        """
+        if (post_id + 5) % 29 == 0 or (post_id + 3) % 13 == 0:
+            sep = b'"method" : "'
         else:
-            post_str = post_str.replace('"method":"', '"method": "', 1)
-        
-        return post_str
+            sep = b'"method": "'
+        return b''.join((
+            b'{"jsonrpc":"2.0",', sep, method.encode(),
+            b'","id":', str(post_id).encode(),
+            b',"params":', orjson.dumps(params), b'}'
+        ))
 
     @staticmethod
-    def deepl_response_to_deeplx(data):
-        alternatives = []
-        if 'result' in data and 'translations' in data['result'] and len(data['result']['translations']) > 0:
-            num_beams = len(data['result']['translations'][0]['beams'])
-            for i in range(num_beams):
-                alternative_str = ""
-                for translation in data['result']['translations']:
-                    if i < len(translation['beams']):  # Check if beam index exists
-                        alternative_str += translation['beams'][i]['sentences'][0]['text']
-                alternatives.append(alternative_str)
-        
+    def build_jobs(sentences: List[Dict[str, Any]], preferred_num_beams: int) -> List[Dict[str, Any]]:
+        """
+        Build the LMT_handle_jobs job list, one job per sentence with its neighbours as context.
+
+        Args:
+            sentences (list): First sentence of each split chunk ({'prefix', 'text'})
+            preferred_num_beams (int): Number of translation alternatives to generate
+
+        Returns:
+            list: Jobs for the LMT_handle_jobs request
+        """
+        texts = [s['text'] for s in sentences]
+        # Sliding context windows: previous/next sentence, empty at either end
+        before = [[]] + [[t] for t in texts[:-1]]
+        after = [[t] for t in texts[1:]] + [[]]
+        return [
+            {
+                "kind": "default",
+                "preferred_num_beams": preferred_num_beams,
+                "raw_en_context_before": b,
+                "raw_en_context_after": a,
+                "sentences": [{
+                    "prefix": s['prefix'],
+                    "text": s['text'],
+                    "id": i + 1
+                }]
+            }
+            for i, (s, b, a) in enumerate(zip(sentences, before, after))
+        ]
+
+    @staticmethod
+    def deepl_response_to_deeplx(data: Dict[str, Any]) -> Dict[str, Any]:
+        result = data['result']
+        # One row of beam texts per translated sentence
+        texts = [[beam['sentences'][0]['text'] for beam in translation['beams']] for translation in result['translations']]
+        # Transpose: alternative i joins beam i of every sentence (missing beams contribute "")
+        alternatives = ["".join(column) for column in zip_longest(*texts, fillvalue="")]
         return {
             "alternatives": alternatives,
             "code": 200,
-            "data": " ".join(translation['beams'][0]['sentences'][0]['text'] for translation in data['result']['translations']),
+            "data": " ".join(row[0] for row in texts),
             "id": data['id'],
             "method": "Free", 
-            "source_lang": data['result']['source_lang'],
-            "target_lang": data['result']['target_lang']
+            "source_lang": result['source_lang'],
+            "target_lang": result['target_lang']
         }
 
     # Convert make_deepl_request to async
-    async def make_deepl_request(self, post_str: str,
+    async def make_deepl_request(self, post_body: bytes,
                                 url_method: str = "LMT_handle_jobs") -> dict:
-        url = f"{self.url}?client=chrome-extension,1.28.0&method={url_method}"
+        url = _URLS[url_method]
 
         try:
-            async with httpx.AsyncClient(
-                headers=self.headers,
-                proxies=self.http_proxy
-            ) as client:
-                response = await client.post(
-                    url=url,
-                    content=post_str
-                )
+            for attempt in range(DEEPL_MAX_RETRIES + 1):
+                async with _DEEPL_SEM:
+                    response = await self.client.post(
+                        url=url,
+                        content=post_body
+                    )
+                if response.status_code != 429 or attempt == DEEPL_MAX_RETRIES:
+                    break
+                # Throttled: back off without holding a slot so other requests keep flowing
+                await asyncio.sleep(DEEPL_RETRY_BACKOFF * 2 ** attempt)
             
             if not response.is_success:
                 return {'error': response.text}
                 
-            try:
-                return response.json()
-            except Exception:
-                return json.loads(brotli.decompress(response.content))
+            # Brotli/gzip bodies are already decoded by the HTTP client
+            return orjson.loads(response.content)
                 
         except Exception as e:
             return {'error': str(e)}
@@ -226,27 +353,63 @@ class DeepLX:
         source_lang = 'auto'
         # Set text_type to html if tag_handling is True, otherwise use detection
         text_type = 'html' if (tag_handling or self.is_richtext(text)) else 'html'
-        post_data = {
-            "jsonrpc": "2.0",
-            "method": "LMT_split_text",
-            "params": {
-                "commonJobParams": {
-                    "mode": "translate"
-                },
-                "lang": {
-                    "lang_user_selected": source_lang
-                },
-                "texts": [text],
-                "textType": text_type
+        params = {
+            "commonJobParams": {
+                "mode": "translate"
+            },
+            "lang": {
+                "lang_user_selected": source_lang
             },
-            "id": self.get_random_number()
+            "texts": [text],
+            "textType": text_type
         }
-        post_str = self.format_post_string(post_data)
-        return await self.make_deepl_request(post_str, url_method="LMT_split_text")
+        post_body = self.build_post_body("LMT_split_text", self.get_random_number(), params)
+        return await self.make_deepl_request(post_body, url_method="LMT_split_text")
 
-    async def deepl_translate(self, text, source_lang='auto', target_lang='en', preferred_num_beams=4, tag_handling=None):
+    async def deepl_handle_jobs(self, sentences: List[Dict[str, Any]], source_lang: str, target_lang: str,
+                                preferred_num_beams: int, i_count: int) -> dict:
+        """
+        Send the LMT_handle_jobs request for already split sentences.
+
+        Args:
+            sentences (list): First sentence of each split chunk ({'prefix', 'text'})
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+            preferred_num_beams (int): Number of translation alternatives to generate
+            i_count (int): Number of 'i' characters in the original text
+
+        Returns:
+            dict: Translation response or error message
+        """
+        params = {
+            "commonJobParams": {
+                "mode": "translate"
+            },
+            "lang": {
+                "source_lang_computed": source_lang.upper(),
+                "target_lang": target_lang.upper()
+            },
+            "jobs": self.build_jobs(sentences, preferred_num_beams),
+            "priority": 1,
+            "timestamp": self.get_timestamp(i_count)
+        }
+        post_body = self.build_post_body("LMT_handle_jobs", self.get_random_number(), params)
+        return await self.make_deepl_request(post_body, url_method="LMT_handle_jobs")
+
+    async def deepl_translate(self, text: str, source_lang: str = 'auto', target_lang: str = 'en',
+                              preferred_num_beams: int = 4, tag_handling: Optional[bool] = None) -> dict:
         """
         Translate text using DeepL's service.
+
+        Short single-line plain text is almost always split into one sentence. For
+        such input with an explicit source_lang the split request is skipped entirely.
+        With source_lang 'auto', the translate request is sent speculatively alongside
+        the split request, guessing the language detected by the previous split in this
+        process (DeepLX.last_detected_lang, shared by all requests, so the guess is only
+        good for mostly single-language traffic). Its result is used only if the split
+        confirms both the single sentence and the language and DeepL returned no error;
+        otherwise it is discarded and a regular request is made. No speculation happens
+        while every DeepL slot is busy, so wrong guesses don't add to throttling.
         
         Args:
             text (str): Text to translate
@@ -261,102 +424,163 @@ class DeepLX:
         if not text:
             return {'error': 'No text to translate'}
             
+        # Count once, before any round-trip, from the str we already have in hand
+        i_count = self.get_i_count(text)
+
+        single_sentence = [{'prefix': '', 'text': text}]
+        is_short = (not tag_handling and len(text) < SHORT_TEXT_LIMIT
+                    and '\n' not in text and not self.is_richtext(text))
+
+        if is_short and source_lang != 'auto':
+            # Language is known and the text is one sentence: no split round-trip needed
+            return await self.deepl_handle_jobs(single_sentence, source_lang, target_lang, preferred_num_beams, i_count)
+
+        guess_lang = DeepLX.last_detected_lang
+        speculative = None
+        if is_short and guess_lang and not _DEEPL_SEM.locked():
+            speculative = asyncio.create_task(self.deepl_handle_jobs(
+                single_sentence, guess_lang, target_lang, preferred_num_beams, i_count
+            ))
+
         split_result = await self.deepl_split_text(text, tag_handling)
         if 'error' in split_result:
+            if speculative:
+                speculative.cancel()
             return split_result
         
+        detected_lang = split_result['result']['lang']['detected']
+        DeepLX.last_detected_lang = detected_lang
         # Set source_lang to detected language from split_result unless explicitly specified
         if source_lang == 'auto':
-            source_lang = split_result['result']['lang']['detected'].lower()
-        
-        i_count = self.get_i_count(text)
+            source_lang = detected_lang.lower()
         
-        # Build jobs array from split text chunks
-        jobs = []
         chunks = split_result['result']['texts'][0]['chunks']
-        for idx, chunk in enumerate(chunks):
-            sentence = chunk['sentences'][0]
-            # Calculate context windows
-            context_before = []
-            context_after = []
-            
-            if idx > 0:
-                context_before = [chunks[idx-1]['sentences'][0]['text']]
-            if idx < len(chunks) - 1:
-                context_after = [chunks[idx+1]['sentences'][0]['text']]
-                
-            jobs.append({
-                "kind": "default",
-                "preferred_num_beams": preferred_num_beams,
-                "raw_en_context_before": context_before,
-                "raw_en_context_after": context_after,
-                "sentences": [{
-                    "prefix": sentence['prefix'],
-                    "text": sentence['text'],
-                    "id": idx + 1
-                }]
-            })
-        
-        post_data = {
-            "jsonrpc": "2.0",
-            "method": "LMT_handle_jobs",
-            "id": self.get_random_number(),
-            "params": {
-                "commonJobParams": {
-                    "mode": "translate"
-                },
-                "lang": {
-                    "source_lang_computed": source_lang.upper(),
-                    "target_lang": target_lang.upper()
-                },
-                "jobs": jobs,
-                "priority": 1,
-                "timestamp": self.get_timestamp(i_count)
-            }
-        }
-        post_str = self.format_post_string(post_data)
-        return await self.make_deepl_request(post_str, url_method="LMT_handle_jobs")
+        sentences = [c['sentences'][0] for c in chunks]
+
+        if speculative and guess_lang:
+            if (source_lang.upper() == guess_lang.upper() and len(sentences) == 1
+                    and sentences[0]['prefix'] == '' and sentences[0]['text'] == text):
+                speculative_result = await speculative
+                if 'error' not in speculative_result:
+                    return speculative_result
+            else:
+                speculative.cancel()
+
+        return await self.deepl_handle_jobs(sentences, source_lang, target_lang, preferred_num_beams, i_count)
+
+class TranslationCache:
+    """
+    In-memory LRU cache of encoded translation responses (TranslationResponse JSON bytes).
+
+    Bounded by number of entries and by the total length of the cached source texts.
+    All access happens on the event loop with no await in between, so no lock is needed.
+    """
+
+    def __init__(self, max_entries: int, max_chars: int):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): Maximum number of cached translations (0 disables caching)
+            max_chars (int): Maximum total characters of cached source texts
+        """
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.entries: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self.chars = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        """Return the cached result for key, marking it most recently used, or None."""
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: bytes) -> None:
+        """Store a result, evicting least recently used entries beyond the bounds."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        else:
+            self.chars += len(key[0])
+        self.entries[key] = value
+        while self.entries and (len(self.entries) > self.max_entries or self.chars > self.max_chars):
+            old_key, _ = self.entries.popitem(last=False)
+            self.chars -= len(old_key[0])
+
+_CACHE = TranslationCache(CACHE_SIZE, CACHE_MAX_CHARS)
 
 # FastAPI routes
 @app.get("/")
 async def root():
     return {"code": 200, "msg": "Go to /translate with POST."}
 
-@app.post("/translate", response_model=TranslationResponse)
+@app.post(
+    "/translate",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _SCHEMAS["TranslationRequest"]}}
+        }
+    },
+    responses={
+        200: {
+            "description": "Successful Response",
+            "content": {"application/json": {"schema": _SCHEMAS["TranslationResponse"]}}
+        }
+    }
+)
 async def translate(
-    request: TranslationRequest,
+    raw_request: Request,
     token_verified: bool = Depends(verify_token),
 ):
     """
     Handle translation requests.
+
+    The body is decoded and validated by msgspec in one pass, and the result is
+    encoded by msgspec as well, bypassing Pydantic on both sides.
     
     Args:
-        request (TranslationRequest): Translation request parameters
+        raw_request (Request): FastAPI request object carrying a TranslationRequest JSON body
         token_verified (bool): Token verification result from dependency
         
     Returns:
-        TranslationResponse: Translation results
+        Response: TranslationResponse JSON
         
     Raises:
-        HTTPException: If translation fails
+        HTTPException: If the body is invalid or translation fails
     """
-    translator = DeepLX(http_proxy=PROXY)
-    
+    try:
+        request = msgspec.json.decode(await raw_request.body(), type=TranslationRequest)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
     # Handle text input (either string or list)
     text = request.text[0] if isinstance(request.text, list) else request.text
+    tag_handling = True if request.tag_handling else False
+
+    # Identical requests translate identically: serve repeats from the cache
+    cache_key = (text, request.source_lang, request.target_lang, tag_handling)
+    cached = _CACHE.get(cache_key)
+    if cached is not None:
+        return Response(cached, media_type='application/json')
+
+    translator = DeepLX(client=raw_request.app.state.http_client)
     
     deepl_response = await translator.deepl_translate(
         text,
         request.source_lang,
         request.target_lang,
         4,
-        True if request.tag_handling else False
+        tag_handling
     )
     
     if 'error' in deepl_response:
         raise HTTPException(status_code=400, detail=deepl_response['error'])
     
-    return translator.deepl_response_to_deeplx(deepl_response)
+    # Encode once; cache hits are served as these exact bytes with no re-serialization
+    body = msgspec.json.encode(translator.deepl_response_to_deeplx(deepl_response))
+    _CACHE.put(cache_key, body)
+    return Response(body, media_type='application/json')
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,15 +1,53 @@
-import brotli
+# Patch blocking sockets before requests/urllib3 are imported so DeepL calls yield under gevent
+from gevent import monkey
+monkey.patch_all()
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import random
-import json
+from itertools import zip_longest
+import orjson
 import os
 from flask import Flask, request, Response
 from flask.views import MethodView
 import re
+from typing import Any
 
 PROXY = os.environ.get('PROXY', None)
-TOKEN = set(os.environ.get('TOKEN', '').split(','))
+TOKEN = frozenset(os.environ.get('TOKEN', '').split(','))
+# Authorization header schemes and their lengths, stripped before token lookup
+_AUTH_PREFIXES = (('Bearer ', 7), ('DeepL-Auth-Key ', 15))
+
+HEADERS = {
+    'accept': '*/*',
+    'accept-encoding': 'gzip, br',
+    'accept-language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh-TW;q=0.7,zh-HK;q=0.6,zh;q=0.5',
+    'authorization': 'None',
+    'cache-control': 'no-cache',
+    'content-type': 'application/json',
+    'dnt': '1',
+    'origin': 'chrome-extension://cofdbpoegempjloogbagkncekinflcnj',
+    'pragma': 'no-cache',
+    'priority': 'u=1, i',
+    'referer': 'https://www.deepl.com/',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'none',
+    'sec-gpc': '1',
+    'user-agent': 'DeepLBrowserExtension/1.29.0 Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36',
+}
+
+DEEPL_URL = "https://www2.deepl.com/jsonrpc?client=chrome-extension,1.29.0"
+URL_HANDLE = f"{DEEPL_URL}?client=chrome-extension,1.28.0&method=LMT_handle_jobs"
+URL_SPLIT = f"{DEEPL_URL}?client=chrome-extension,1.28.0&method=LMT_split_text"
+_URLS = {'LMT_handle_jobs': URL_HANDLE, 'LMT_split_text': URL_SPLIT}
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Inputs shorter than this (single line, no tags) are treated as one sentence
+SHORT_TEXT_LIMIT = 500
 
 
 app = Flask(__name__)
@@ -32,16 +70,15 @@ def verify_token(request):
     auth_header = request.headers.get('Authorization', '')
     
     # Extract token from different Authorization header formats
-    token_header = ''
-    if auth_header.startswith('Bearer '):
-        token_header = auth_header[7:]
-    elif auth_header.startswith('DeepL-Auth-Key '):
-        token_header = auth_header[15:]
+    for prefix, prefix_len in _AUTH_PREFIXES:
+        if auth_header.startswith(prefix):
+            token_header = auth_header[prefix_len:]
+            break
     else:
         token_header = auth_header
     
     # Check if any token variant matches
-    return any(token in TOKEN for token in [token_param, token_header])
+    return token_param in TOKEN or token_header in TOKEN
 
 class Translator(MethodView):
     def get(self):
@@ -49,15 +86,15 @@ class Translator(MethodView):
 
     def post(self):
         if not verify_token(request):
-            return Response(json.dumps({'error': 'Invalid Token'}), status=401, mimetype='application/json')
+            return Response(orjson.dumps({'error': 'Invalid Token'}), status=401, mimetype='application/json')
         
         # Validate request data
         try:
             req = TranslationRequest(request.json)
         except Exception as e:
-            return Response(json.dumps({'error': str(e)}), status=400, mimetype='application/json')
+            return Response(orjson.dumps({'error': str(e)}), status=400, mimetype='application/json')
         
-        translator = DeepLX(http_proxy=PROXY)
+        translator = _SHARED
         deepl_response = translator.deepl_translate(
             req.text,
             req.source_lang,
@@ -67,53 +104,26 @@ class Translator(MethodView):
         )
         
         if 'error' in deepl_response:
-            return Response(json.dumps({'error': deepl_response['error']}), status=400, mimetype='application/json')
+            return Response(orjson.dumps({'error': deepl_response['error']}), status=400, mimetype='application/json')
             
         response_body = translator.deepl_response_to_deeplx(deepl_response)
-        return Response(json.dumps(response_body), mimetype='application/json')
+        return Response(orjson.dumps(response_body), mimetype='application/json')
 
 ## Helper Functions
 
 class DeepLX(object):
-    def __init__(self, http_proxy=None):
-        self.url = "https://www2.deepl.com/jsonrpc?client=chrome-extension,1.29.0"
-        self.headers = {
-            'accept': '*/*',
-            'accept-language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh-TW;q=0.7,zh-HK;q=0.6,zh;q=0.5',
-            'authorization': 'None',
-            'cache-control': 'no-cache',
-            'content-type': 'application/json',
-            'dnt': '1',
-            'origin': 'chrome-extension://cofdbpoegempjloogbagkncekinflcnj',
-            'pragma': 'no-cache',
-            'priority': 'u=1, i',
-            'referer': 'https://www.deepl.com/',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'none',
-            'sec-gpc': '1',
-            'user-agent': 'DeepLBrowserExtension/1.29.0 Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36',
-        }
+    def __init__(self, http_proxy: str | None = None):
+        self.proxies = {'http': http_proxy, 'https': http_proxy} if http_proxy else None
         self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        
-        # Proxy setup
-        self.proxies = None
-        if http_proxy:
-            self.proxies = {
-                'http': http_proxy,
-                'https': http_proxy
-            }
-        self.session.proxies = self.proxies
-
-        # Proxy
-        self.http_proxy = http_proxy
-        self.proxies = None
-        if http_proxy:
-            self.proxies = {
-                'http': http_proxy,
-                'https': http_proxy
-            }
+        self.session.headers.update(HEADERS)
+        if self.proxies:
+            self.session.proxies.update(self.proxies)
+        # Pooled keep-alive connections to DeepL, shared by every Flask request
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=128,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
 
 
     @staticmethod
@@ -122,9 +132,7 @@ class DeepLX(object):
 
     @staticmethod
     def get_random_number() -> int:
-        src = random.Random(time.time_ns())
-        num = src.randint(8300000, 8399999)
-        return num * 1000
+        return random.randrange(8_300_000_000, 8_400_000_000, 1000)
 
     @staticmethod
     def get_timestamp(i_count: int) -> int:
@@ -141,153 +149,155 @@ class DeepLX(object):
         Check if text contains HTML-like tags
         Returns True if HTML-like tags are found, otherwise False
         """
+        # Plain text (no '<' at all) is the common case: settle it with one C-level scan
+        if '<' not in text:
+            return False
         # Simple check for presence of HTML-like tags
-        if re.search(r'<[^>]+>', text):
-            return True
-        return False
+        return bool(_TAG_RE.search(text))
 
     @staticmethod
-    def format_post_string(post_data: dict) -> str:
-        """Format the JSON string with specific spacing rules for the 'method' field"""
-        post_str = json.dumps(post_data, ensure_ascii=False)
-        
-        if (post_data["id"] + 5) % 29 == 0 or (post_data["id"] + 3) % 13 == 0:
-            post_str = post_str.replace('"method":"', '"method" : "', 1)
+    def build_post_body(method: str, post_id: int, params: dict[str, Any]) -> bytes:
+        """
+        Serialize a JSON-RPC request with DeepL's spacing rules for the 'method' field.
+
+        Only params goes through orjson; the envelope is assembled around it with
+        the right spacing chosen up front, so the output is never rescanned.
+        """
+        if (post_id + 5) % 29 == 0 or (post_id + 3) % 13 == 0:
+            sep = b'"method" : "'
         else:
-            post_str = post_str.replace('"method":"', '"method": "', 1)
-        
-        return post_str
+            sep = b'"method": "'
+        return b''.join((
+            b'{"jsonrpc":"2.0",', sep, method.encode(),
+            b'","id":', str(post_id).encode(),
+            b',"params":', orjson.dumps(params), b'}'
+        ))
 
-    def make_deepl_request(self, post_str: str,
+    def make_deepl_request(self, post_body: bytes,
                            url_method: str = "LMT_handle_jobs") -> dict:
         """
         Make HTTP request to DeepL API and handle the response
         Returns JSON response or error dictionary
         """
-        url = f"{self.url}?client=chrome-extension,1.28.0&method={url_method}"
+        url = _URLS[url_method]
 
         try:
             response = self.session.post(
                 url,
-                post_str,
+                post_body,
             )
             
             if not response.ok:
                 return {'error': response.text}
                 
-            try:
-                return response.json()
-            except Exception:
-                return json.loads(brotli.decompress(response.content))
+            # Brotli/gzip bodies are already decoded by the HTTP client
+            return orjson.loads(response.content)
                 
         except Exception as e:
             return {'error': str(e)}
 
 
     @staticmethod
-    def deepl_response_to_deeplx(data):
-        alternatives = []
-        if 'result' in data and 'translations' in data['result'] and len(data['result']['translations']) > 0:
-            num_beams = len(data['result']['translations'][0]['beams'])
-            for i in range(num_beams):
-                alternative_str = ""
-                for translation in data['result']['translations']:
-                    if i < len(translation['beams']):  # Check if beam index exists
-                        alternative_str += translation['beams'][i]['sentences'][0]['text']
-                alternatives.append(alternative_str)
+    def build_jobs(sentences: list[dict[str, Any]], preferred_num_beams: int) -> list[dict[str, Any]]:
+        """Build one LMT_handle_jobs job per sentence, with its neighbours as context"""
+        texts = [s['text'] for s in sentences]
+        # Sliding context windows: previous/next sentence, empty at either end
+        before = [[]] + [[t] for t in texts[:-1]]
+        after = [[t] for t in texts[1:]] + [[]]
+        return [
+            {
+                "kind": "default",
+                "preferred_num_beams": preferred_num_beams,
+                "raw_en_context_before": b,
+                "raw_en_context_after": a,
+                "sentences": [{
+                    "prefix": s['prefix'],
+                    "text": s['text'],
+                    "id": i + 1
+                }]
+            }
+            for i, (s, b, a) in enumerate(zip(sentences, before, after))
+        ]
+
+    @staticmethod
+    def deepl_response_to_deeplx(data: dict[str, Any]) -> dict[str, Any]:
+        result = data['result']
+        # One row of beam texts per translated sentence
+        texts = [[beam['sentences'][0]['text'] for beam in translation['beams']] for translation in result['translations']]
+        # Transpose: alternative i joins beam i of every sentence (missing beams contribute "")
+        alternatives = ["".join(column) for column in zip_longest(*texts, fillvalue="")]
         return {
             "alternatives": alternatives,
             "code": 200,
-            "data": " ".join(translation['beams'][0]['sentences'][0]['text'] for translation in data['result']['translations']),
+            "data": " ".join(row[0] for row in texts),
             "id": data['id'],
             "method": "Free", 
-            "source_lang": data['result']['source_lang'],
-            "target_lang": data['result']['target_lang']
+            "source_lang": result['source_lang'],
+            "target_lang": result['target_lang']
         }
 
     ## Translate Functions
 
-    def deepl_split_text(self, text: str, tag_handling: bool = None) -> dict:
+    def deepl_split_text(self, text: str, tag_handling: bool | None = None) -> dict:
         source_lang = 'auto'
         # Set text_type to richtext if tag_handling is True, otherwise use detection
         text_type = 'richtext' if (tag_handling or self.is_richtext(text)) else 'plaintext'
-        post_data = {
-            "jsonrpc": "2.0",
-            "method": "LMT_split_text",
-            "params": {
-                "commonJobParams": {
-                    "mode": "translate"
-                },
-                "lang": {
-                    "lang_user_selected": source_lang
-                },
-                "texts": [text],
-                "textType": text_type
+        params = {
+            "commonJobParams": {
+                "mode": "translate"
+            },
+            "lang": {
+                "lang_user_selected": source_lang
             },
-            "id": self.get_random_number()
+            "texts": [text],
+            "textType": text_type
         }
-        post_str = self.format_post_string(post_data)
-        return self.make_deepl_request(post_str, url_method="LMT_split_text")
+        post_body = self.build_post_body("LMT_split_text", self.get_random_number(), params)
+        return self.make_deepl_request(post_body, url_method="LMT_split_text")
 
 
     def deepl_translate(self, text: str, source_lang: str = 'auto', target_lang: str = 'en', preferred_num_beams: int = 4, tag_handling: bool | None = None) -> dict:
         if not text:
             return {'error': 'No text to translate'}
 
-        split_result = self.deepl_split_text(text, tag_handling)
-
-        if 'error' in split_result:
-            return split_result
-        # Set source_lang to detected language from split_result unless explicitly specified
-        if source_lang == 'auto':
-            source_lang = split_result['result']['lang']['detected'].lower()
+        # Count once, before any round-trip, from the str we already have in hand
         i_count = self.get_i_count(text)
+
+        if (source_lang != 'auto' and not tag_handling and len(text) < SHORT_TEXT_LIMIT
+                and '\n' not in text and not self.is_richtext(text)):
+            # Language is known and the text is one sentence: no split round-trip needed
+            sentences = [{'prefix': '', 'text': text}]
+        else:
+            split_result = self.deepl_split_text(text, tag_handling)
+
+            if 'error' in split_result:
+                return split_result
+            # Set source_lang to detected language from split_result unless explicitly specified
+            if source_lang == 'auto':
+                source_lang = split_result['result']['lang']['detected'].lower()
+            chunks = split_result['result']['texts'][0]['chunks']
+            sentences = [c['sentences'][0] for c in chunks]
         # Build jobs array from split text chunks
-        jobs = []
-        chunks = split_result['result']['texts'][0]['chunks']
-        for idx, chunk in enumerate(chunks):
-            sentence = chunk['sentences'][0]
-            # Calculate context windows
-            context_before = []
-            context_after = []
-            
-            if idx > 0:
-                context_before = [chunks[idx-1]['sentences'][0]['text']]
-            if idx < len(chunks) - 1:
-                context_after = [chunks[idx+1]['sentences'][0]['text']]
+        jobs = self.build_jobs(sentences, int(preferred_num_beams))
 
-            jobs.append({
-                "kind": "default",
-                "preferred_num_beams": int(preferred_num_beams),
-                "raw_en_context_before": context_before,
-                "raw_en_context_after": context_after,
-                "sentences": [{
-                    "prefix": sentence['prefix'],
-                    "text": sentence['text'],
-                    "id": idx + 1
-                }]
-            })
-
-        post_data = {
-            "jsonrpc": "2.0",
-            "method": "LMT_handle_jobs",
-            "id": self.get_random_number(),
-            "params": {
-                "commonJobParams": {
-                    "mode": "translate"
-                },
-                "lang": {
-                    "source_lang_computed": source_lang.upper(),
-                    "target_lang": target_lang.upper()
-                },
-                "jobs": jobs,
-                "priority": 1,
-                "timestamp": self.get_timestamp(i_count)
-            }
+        params = {
+            "commonJobParams": {
+                "mode": "translate"
+            },
+            "lang": {
+                "source_lang_computed": source_lang.upper(),
+                "target_lang": target_lang.upper()
+            },
+            "jobs": jobs,
+            "priority": 1,
+            "timestamp": self.get_timestamp(i_count)
         }
         
-        post_str = self.format_post_string(post_data)
-        return self.make_deepl_request(post_str, url_method="LMT_handle_jobs")
+        post_body = self.build_post_body("LMT_handle_jobs", self.get_random_number(), params)
+        return self.make_deepl_request(post_body, url_method="LMT_handle_jobs")
+
+# One client (and connection pool) per process
+_SHARED = DeepLX(http_proxy=PROXY)
 
 # Register routes
 app.add_url_rule('/', view_func=Translator.as_view('root'))
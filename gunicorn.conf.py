@@ -0,0 +1,12 @@
+# Gunicorn settings for the WSGI version (app/app_wsgi.py)
+# Run from the repository root: gunicorn
+import os
+
+pythonpath = 'app'
+wsgi_app = 'app_wsgi:app'
+bind = '0.0.0.0:8000'
+
+# gevent workers yield while waiting on DeepL, so each worker serves many requests at once
+worker_class = 'gevent'
+workers = os.cpu_count() or 1
+worker_connections = 1000